@@ -1,5 +1,5 @@
-from fastapi import FastAPI, APIRouter
-from endpoint import router
+from fastapi import APIRouter
+from api.api_v1.endpoint import router
 api_router = APIRouter()
 
-api_router.add_api_route("/", router=router, tags=["API V1"])
\ No newline at end of file
+api_router.include_router(router, tags=["API V1"])
@@ -0,0 +1,17 @@
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from api.api_v1.api import api_router
+from app.main import lifespan, RateLimitMiddleware, TRUST_FORWARDED_FOR, TRUSTED_PROXY_COUNT
+
+
+app = FastAPI(
+    title="Employee Search Directory API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(
+    RateLimitMiddleware,
+    trust_forwarded_for=TRUST_FORWARDED_FOR,
+    trusted_proxies=TRUSTED_PROXY_COUNT,
+)
+app.include_router(api_router, prefix="/api_v1")
@@ -1,83 +1,254 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from sqlalchemy import select, insert, bindparam, table, column, literal_column, func, or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from contextlib import asynccontextmanager
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import OrderedDict
+import asyncio
+import csv
+import io
+import itertools
 import logging
+import os
+import threading
+import time
 
-from app.database import get_db, init_db, Employee
-from app.schemas import EmployeeResponse
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is only needed when REDIS_URL is set
+    aioredis = None
+    RedisError = OSError
+
+from app.database import get_db, init_db, Employee, SessionLocal
+from app.schemas import EmployeeCreate, EmployeeResponse, BulkInsertResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional Redis URL; when set, rate limits are shared across workers and replicas
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Trust the client IP from X-Forwarded-For; only enable behind a proxy that sets it
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes")
+# Number of proxies in front of the app that append to X-Forwarded-For
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "1"))
+
+
+class ClientIPMiddleware:
+    """ASGI middleware that resolves the client IP once per request.
+
+    The IP is stored in ``scope["state"]["client_ip"]`` (``request.state.client_ip``).
+    With ``trust_forwarded_for``, the address that the outermost of
+    ``trusted_proxies`` proxies appended to X-Forwarded-For is used. Entries
+    to the left of it were sent by the client and may be forged.
+    """
+    
+    def __init__(self, app, trust_forwarded_for: bool = False, trusted_proxies: int = 1):
+        self.app = app
+        self.trust_forwarded_for = trust_forwarded_for
+        self.trusted_proxies = max(1, trusted_proxies)
+    
+    def resolve_client_ip(self, scope) -> str:
+        """Return the client IP for an HTTP scope and store it in the scope state."""
+        client_ip = None
+        if self.trust_forwarded_for:
+            # Proxies may append a new header line instead of extending the last one
+            forwarded = b",".join(value for key, value in scope["headers"] if key == b"x-forwarded-for")
+            entries = [entry.strip() for entry in forwarded.split(b",") if entry.strip()]
+            if entries:
+                client_ip = entries[-min(self.trusted_proxies, len(entries))].decode("latin-1")
+        if client_ip is None:
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
+        scope.setdefault("state", {})["client_ip"] = client_ip
+        return client_ip
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.resolve_client_ip(scope)
+        await self.app(scope, receive, send)
+
 
 # Custom rate limiter implementation
 class RateLimiter:
-    """Simple in-memory rate limiter that tracks requests per IP per minute."""
+    """Simple in-memory rate limiter that tracks requests per IP per minute.
+
+    Uses a sliding-window counter: each IP keeps the request count of the
+    current and previous fixed one-minute windows, and the previous count is
+    weighted by how much of it still overlaps the sliding window.
+
+    State is split into shards by ``hash(ip)``, each guarded by its own lock,
+    so concurrent requests only contend when their IPs land in the same shard.
+    """
+    
+    NUM_SHARDS = 64  # Must be a power of two
+    MAX_TRACKED_IPS = 100_000  # Upper bound on IPs kept in memory
+    WINDOW_SECONDS = 60.0  # Length of each fixed window
     
     def __init__(self, max_requests: int = 30):
         self.max_requests = max_requests
-        self.requests = defaultdict(list)  # IP -> list of request timestamps
-        self.last_cleanup = datetime.now()
+        self.reset()
+    
+    def reset(self):
+        """Forget all tracked requests."""
+        # Per shard: IP -> [previous window count, current window count, current window],
+        # ordered from least to most recently seen
+        self._shards = [OrderedDict() for _ in range(self.NUM_SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.NUM_SHARDS)]
+        self._shard_capacity = max(1, self.MAX_TRACKED_IPS // self.NUM_SHARDS)
     
     def is_allowed(self, client_ip: str) -> bool:
         """Check if a request from the given IP is allowed."""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-        
-        # Clean up old requests for this IP
-        self.requests[client_ip] = [
-            timestamp for timestamp in self.requests[client_ip]
-            if timestamp > one_minute_ago
-        ]
-        
-        # Periodically cleanup old IP entries (every 5 minutes)
-        if (now - self.last_cleanup).total_seconds() > 300:
-            self._cleanup_old_entries()
-            self.last_cleanup = now
+        index = hash(client_ip) & (self.NUM_SHARDS - 1)
+        shard = self._shards[index]
+        now = time.monotonic()
+        window_seconds = self.WINDOW_SECONDS
+        window = int(now // window_seconds)
         
-        # Check if under limit
-        if len(self.requests[client_ip]) >= self.max_requests:
-            return False
-        
-        # Add current request
-        self.requests[client_ip].append(now)
-        return True
-    
-    def _cleanup_old_entries(self):
-        """Remove entries for IPs that haven't made requests recently (internal method)."""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-        
-        ips_to_remove = []
-        for ip, timestamps in list(self.requests.items()):
-            # Remove old timestamps
-            self.requests[ip] = [ts for ts in timestamps if ts > one_minute_ago]
-            # Mark for removal if no recent requests
-            if not self.requests[ip]:
-                ips_to_remove.append(ip)
-        
-        for ip in ips_to_remove:
-            del self.requests[ip]
+        # Read, check and update atomically for this IP
+        with self._locks[index]:
+            state = shard.get(client_ip)
+            if state is not None:
+                shard.move_to_end(client_ip)
+            if state is None or state[2] != window:
+                # Roll over: the old current window becomes the previous one
+                # only if it is directly adjacent to the new window
+                previous = state[1] if state is not None and state[2] == window - 1 else 0
+                state = [previous, 0, window]
+            
+            # Weight the previous window by its overlap with the sliding window
+            elapsed = (now % window_seconds) / window_seconds
+            estimate = state[0] * (1 - elapsed) + state[1]
+            if estimate >= self.max_requests:
+                return False
+            
+            # Count current request; only admitted IPs are stored
+            state[1] += 1
+            if client_ip not in shard and len(shard) >= self._shard_capacity:
+                # Evict the least recently seen IP to bound memory
+                shard.popitem(last=False)
+            shard[client_ip] = state
+            return True
+
+
+# Atomic sliding-window log in Redis: trim expired entries, count, and record
+# the request in a single round trip. Uses the Redis server clock so every
+# worker and replica agrees on the window.
+# KEYS[1] = per-IP key, ARGV[1] = window (ms), ARGV[2] = limit, ARGV[3] = random member id
+SLIDING_WINDOW_LUA = """
+local now = redis.call('TIME')
+local now_ms = now[1] * 1000 + math.floor(now[2] / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now_ms - tonumber(ARGV[1]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now_ms, now_ms .. '-' .. ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class RedisRateLimiter:
+    """Rate limiter whose per-IP state lives in Redis, shared by all workers.
+
+    After a Redis error the limiter reports itself unavailable for
+    ``RETRY_AFTER`` seconds, so a dead server is not retried on every request.
+    """
+    
+    # Short socket timeouts: an unreachable Redis must fail fast, not stall requests
+    SOCKET_TIMEOUT = 0.2
+    RETRY_AFTER = 5.0
+    
+    def __init__(self, url: str, max_requests: int = 30, window_ms: int = 60_000):
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+        self.max_requests = max_requests
+        self.window_ms = window_ms
+        self.client = aioredis.from_url(
+            url,
+            socket_connect_timeout=self.SOCKET_TIMEOUT,
+            socket_timeout=self.SOCKET_TIMEOUT,
+        )
+        self._unavailable_until = 0.0
+        # Script objects run via EVALSHA and only resend the source on NOSCRIPT
+        self._script = self.client.register_script(SLIDING_WINDOW_LUA)
+    
+    async def load(self):
+        """Load the Lua script into the Redis script cache."""
+        await self.client.script_load(SLIDING_WINDOW_LUA)
+    
+    @property
+    def available(self) -> bool:
+        """False for a while after a Redis error."""
+        return time.monotonic() >= self._unavailable_until
+    
+    async def is_allowed(self, client_ip: str) -> bool:
+        """Check if a request from the given IP is allowed."""
+        # Random member id so requests in the same millisecond don't collide
+        member = os.urandom(4).hex()
+        try:
+            result = await self._script(
+                keys=[f"rate_limit:{client_ip}"],
+                args=[self.window_ms, self.max_requests, member],
+            )
+        except RedisError:
+            self._unavailable_until = time.monotonic() + self.RETRY_AFTER
+            raise
+        return result == 1
+    
+    async def close(self):
+        """Close the Redis connection pool."""
+        await self.client.aclose()
 
 
 # Initialize rate limiter
 rate_limiter = RateLimiter(max_requests=30)
+redis_rate_limiter = RedisRateLimiter(REDIS_URL, max_requests=30) if REDIS_URL else None
 
 
-async def check_rate_limit(request: Request):
-    """Dependency to check rate limit for incoming requests."""
-    client_ip = request.client.host if request.client else "unknown"
+async def check_rate_limit(client_ip: str) -> bool:
+    """Return True if a request from the given IP is within the rate limit."""
+    if redis_rate_limiter is not None and redis_rate_limiter.available:
+        try:
+            allowed = await redis_rate_limiter.is_allowed(client_ip)
+        except RedisError as e:
+            # Keep serving with a per-process limit while Redis is unavailable
+            logger.warning(f"Redis rate limiter unavailable, falling back to in-memory: {e}")
+            allowed = rate_limiter.is_allowed(client_ip)
+    else:
+        allowed = rate_limiter.is_allowed(client_ip)
     
-    if not rate_limiter.is_allowed(client_ip):
+    if not allowed:
         logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-        raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Maximum 30 requests per minute allowed."
-        )
+    return allowed
+
+
+# Interactive docs and the schema are not rate limited
+RATE_LIMIT_EXEMPT_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"})
+
+
+class RateLimitMiddleware(ClientIPMiddleware):
+    """ASGI middleware that enforces the per-IP rate limit before routing.
+
+    Running the check here instead of as a route dependency skips FastAPI's
+    dependency resolution, and rejected requests never reach the router.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            client_ip = self.resolve_client_ip(scope)
+            if scope["path"] not in RATE_LIMIT_EXEMPT_PATHS and not await check_rate_limit(client_ip):
+                response = ORJSONResponse(
+                    {"detail": "Rate limit exceeded. Maximum 30 requests per minute allowed."},
+                    status_code=429,
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
 
 
 @asynccontextmanager
@@ -86,9 +257,25 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
     logger.info("Database initialized successfully")
-    logger.info("Rate limiter initialized: 30 requests per minute per IP")
+    load_filter_vocabulary()
+    vocabulary_refresher = asyncio.create_task(
+        refresh_filter_vocabulary(FILTER_VOCABULARY_REFRESH_SECONDS)
+    )
+    if redis_rate_limiter is not None:
+        try:
+            await redis_rate_limiter.load()
+        except RedisError as e:
+            logger.warning(f"Could not load rate limit script into Redis: {e}")
+        logger.info("Rate limiter initialized: 30 requests per minute per IP (Redis)")
+    else:
+        logger.info("Rate limiter initialized: 30 requests per minute per IP")
+        if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+            logger.warning("WEB_CONCURRENCY > 1 without REDIS_URL: each worker enforces its own rate limit")
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    vocabulary_refresher.cancel()
+    if redis_rate_limiter is not None:
+        await redis_rate_limiter.close()
     logger.info("Application shutting down")
 
 
@@ -98,11 +285,251 @@ app = FastAPI(
     description="A FastAPI microservice for searching employee directory",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(
+    RateLimitMiddleware,
+    trust_forwarded_for=TRUST_FORWARDED_FOR,
+    trusted_proxies=TRUSTED_PROXY_COUNT,
 )
 
 
+def build_status_lookup():
+    """Map every accepted status string to its status tuple (None means no filter)."""
+    lookup = {"all": None}
+    for size in range(1, len(VALID_STATUSES) + 1):
+        for combination in itertools.combinations(VALID_STATUSES, size):
+            for ordering in itertools.permutations(combination):
+                lookup[",".join(map(str, ordering))] = combination
+    return lookup
+
+
+VALID_STATUSES = (0, 1, 2)
+# "0", "1,0", "2,0,1", ... -> sorted tuple; parsed once instead of per request
+STATUS_LOOKUP = build_status_lookup()
+
+# Bit flags for the optional search filters present in a request
+FILTER_NAME = 1
+FILTER_DEPARTMENT = 2
+FILTER_POSITION = 4
+FILTER_LOCATION = 8
+FILTER_STATUS = 16
+FILTER_NAME_FTS = 32  # Name search through the SQLite FTS5 trigram index
+FILTER_NAME_PREFIX = 64  # First or last name starts with the query
+FILTER_AFTER_ID = 128  # Keyset pagination: rows after a given id, in id order
+
+# Name queries shorter than a trigram cannot use the trigram indexes
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+employees_fts = table("employees_fts", column("rowid"))
+
+# Escape character for LIKE patterns built from user input
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value only matches itself."""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+# Columns returned by search (full_name is an internal search column)
+SEARCH_COLUMNS = [
+    Employee.id,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.contact_info,
+    Employee.department,
+    Employee.position,
+    Employee.location,
+    Employee.status,
+]
+
+
+def build_search_statement(mask: int):
+    """Build the parameterized search statement for one combination of filters."""
+    # Select plain table columns so rows skip ORM instance construction
+    stmt = select(*SEARCH_COLUMNS)
+    if mask & FILTER_STATUS:
+        stmt = stmt.where(Employee.status.in_(bindparam("statuses", expanding=True)))
+    if mask & FILTER_NAME:
+        # full_name is already lowercased, so a plain LIKE is case-insensitive
+        stmt = stmt.where(Employee.full_name.like(bindparam("name_pattern"), escape=LIKE_ESCAPE))
+    if mask & FILTER_NAME_PREFIX:
+        # Matches the lower(...) text_pattern_ops indexes, so PostgreSQL can
+        # use a B-tree range scan per column instead of the trigram index
+        name_prefix = bindparam("name_prefix")
+        stmt = stmt.where(
+            or_(
+                func.lower(Employee.first_name).like(name_prefix, escape=LIKE_ESCAPE),
+                func.lower(Employee.last_name).like(name_prefix, escape=LIKE_ESCAPE),
+            )
+        )
+    if mask & FILTER_NAME_FTS:
+        stmt = stmt.where(
+            Employee.id.in_(
+                select(employees_fts.c.rowid).where(
+                    literal_column("employees_fts").match(bindparam("name_query"))
+                )
+            )
+        )
+    if mask & FILTER_DEPARTMENT:
+        stmt = stmt.where(Employee.department == bindparam("department"))
+    if mask & FILTER_POSITION:
+        stmt = stmt.where(Employee.position == bindparam("position"))
+    if mask & FILTER_LOCATION:
+        stmt = stmt.where(Employee.location == bindparam("location"))
+    if mask & FILTER_AFTER_ID:
+        # Seek past the previous page through the primary key instead of
+        # reading and discarding OFFSET rows
+        stmt = stmt.where(Employee.id > bindparam("after_id")).order_by(Employee.id)
+    return stmt.offset(bindparam("offset")).limit(bindparam("limit"))
+
+
+# One statement per filter combination, built once instead of per request
+SEARCH_STATEMENTS = {mask: build_search_statement(mask) for mask in range(256)}
+
+
+class SearchCache:
+    """Small thread-safe TTL cache of serialized search responses.
+
+    Repeat searches (e.g. polling dashboards) are answered from memory for a
+    few seconds without touching the database. Entries are evicted least
+    recently used once ``maxsize`` is reached.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires at, JSON body)
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[bytes]:
+        """Return the cached body for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, body: bytes):
+        """Cache body for key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached responses (called after writes)."""
+        with self._lock:
+            self._entries.clear()
+
+
+search_cache = SearchCache(maxsize=1024, ttl=5.0)
+
+
+class FilterVocabulary:
+    """Distinct department, position and location values, kept in memory.
+
+    These columns have low cardinality, so an exact-match filter on a value
+    that does not exist can be answered with no rows without a query. The
+    sets are loaded at startup and extended by ``add`` on inserts; requests
+    never reload them. Until they are loaded every filter runs its query.
+    """
+    
+    COLUMNS = ("department", "position", "location")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget the loaded values; filters run their query until the next refresh."""
+        self._values = None  # column -> frozenset of values
+    
+    def refresh(self, db: Session):
+        """Load the distinct values of each column from the database."""
+        values = {
+            name: frozenset(db.execute(select(getattr(Employee, name)).distinct()).scalars())
+            for name in self.COLUMNS
+        }
+        with self._lock:
+            self._values = values
+    
+    def add(self, rows: List[dict]):
+        """Add the values of newly inserted rows."""
+        with self._lock:
+            if self._values is not None:
+                self._values = {
+                    name: known | {row[name] for row in rows}
+                    for name, known in self._values.items()
+                }
+    
+    def matches(self, **filters: Optional[str]) -> bool:
+        """Return False if any given filter value is not present in the table."""
+        values = self._values
+        if values is None:
+            return True
+        return all(value is None or value in values[name] for name, value in filters.items())
+
+
+filter_vocabulary = FilterVocabulary()
+
+# Background reload interval; picks up rows inserted by other workers or by
+# insert_employees.py without scanning the table on the request path
+FILTER_VOCABULARY_REFRESH_SECONDS = 300.0
+
+
+def load_filter_vocabulary():
+    """Load the filter vocabulary with a session of its own."""
+    with SessionLocal() as db:
+        filter_vocabulary.refresh(db)
+
+
+async def refresh_filter_vocabulary(interval: float):
+    """Reload the filter vocabulary every ``interval`` seconds in a worker thread."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(load_filter_vocabulary)
+        except Exception as e:
+            logger.warning(f"Could not refresh filter vocabulary: {e}")
+
+
+# Pages at least this large are streamed in batches instead of buffered
+STREAM_MIN_LIMIT = 500
+STREAM_BATCH_SIZE = 200
+
+
+def stream_employees(db: Session, statement, params: dict):
+    """Yield the search results as a JSON array, one batch of rows at a time."""
+    # The get_db dependency has already closed the session by the time the
+    # response body is sent; a closed Session can be reused, so the query
+    # opens a fresh connection here and the session is closed again below
+    try:
+        result = db.execute(
+            statement, params, execution_options={"yield_per": STREAM_BATCH_SIZE}
+        ).mappings()
+        yield b"["
+        separator = b""
+        for rows in result.partitions():
+            # Serialize the batch as an array and drop its brackets
+            yield separator + orjson.dumps([dict(row) for row in rows])[1:-1]
+            separator = b","
+        yield b"]"
+    finally:
+        db.close()
+
+
 @app.get("/", tags=["Health"])
-async def root(request: Request, _: None = Depends(check_rate_limit)):
+async def root():
     """Root endpoint for health check."""
     return {
         "message": "Employee Search Directory API",
@@ -111,69 +538,163 @@ async def root(request: Request, _: None = Depends(check_rate_limit)):
     }
 
 
-@app.get("/employees/", response_model=List[EmployeeResponse], tags=["Search"])
-async def search_employees(
-    request: Request,
+# Search responses are serialized directly; the model only documents the schema
+SEARCH_RESPONSES = {200: {"model": List[EmployeeResponse], "description": "Matching employees"}}
+
+
+@app.get("/employees/", response_model=None, responses=SEARCH_RESPONSES, tags=["Search"])
+def search_employees(
     name: Optional[str] = Query(None, description="Search by first name or last name"),
+    name_match: str = Query("contains", pattern="^(contains|prefix)$",
+                            description="Match names containing the query, or only names starting with it"),
     department: Optional[str] = Query(None, description="Filter by department"),
     position: Optional[str] = Query(None, description="Filter by position"),
     location: Optional[str] = Query(None, description="Filter by location"),
     status: str = Query("all", description="Filter by status: 0, 1, 2, all, or comma-separated like '0,1'"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    after_id: Optional[int] = Query(None, ge=0, description="Return employees with id greater than this, ordered by id"),
     db: Session = Depends(get_db),
-    _: None = Depends(check_rate_limit),
 ):
     """
     Search employees with various filters.
+
+    Declared as a plain function so FastAPI runs the blocking database call
+    in its threadpool instead of on the event loop.
     
-    - **name**: Search in first_name and last_name (partial match, case-insensitive)
+    - **name**: Search the full name, "first_name last_name" (partial match, case-insensitive)
+    - **name_match**: "contains" (default) to match anywhere in the full name, or "prefix" to match only the start of first_name or last_name
     - **department**: Exact match for department
     - **position**: Exact match for position
     - **location**: Exact match for location
     - **status**: Filter by status - can be "0", "1", "2", "all", or comma-separated like "0,1" or "0,1,2"
     - **limit**: Maximum number of results (default: 100, max: 1000)
     - **offset**: Skip this many results (for pagination)
+    - **after_id**: Keyset pagination; pass the id of the last employee of the previous page
     """
-    query = db.query(Employee)
+    mask = 0
+    params = {"offset": offset, "limit": limit}
 
     # Filter by status
-    if status.lower() != "all":
-        try:
-            # Parse status values (support comma-separated)
-            status_values = [int(s.strip()) for s in status.split(",")]
-            # Validate status values
-            for s in status_values:
-                if s not in [0, 1, 2]:
-                    raise ValueError(f"Invalid status value: {s}")
-            query = query.filter(Employee.status.in_(status_values))
-        except ValueError as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid status parameter. Must be 0, 1, 2, all, or comma-separated values. Error: {str(e)}",
-            )
+    status_key = status.replace(" ", "").lower()
+    if status_key not in STATUS_LOOKUP:
+        # The table only holds distinct values; normalize repeats like "1,1"
+        status_key = ",".join(sorted(set(status_key.split(","))))
+    if status_key not in STATUS_LOOKUP:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status parameter. Must be 0, 1, 2, all, or comma-separated values. Got: {status!r}",
+        )
+    status_values = STATUS_LOOKUP[status_key]
+    if status_values is not None:
+        mask |= FILTER_STATUS
+        params["statuses"] = status_values
 
-    # Filter by name (search in both first_name and last_name)
+    # Filter by name (contains: anywhere in "first last"; prefix: start of either name)
     if name:
-        search_pattern = f"%{name}%"
-        query = query.filter(
-            (Employee.first_name.ilike(search_pattern))
-            | (Employee.last_name.ilike(search_pattern))
-        )
+        if name_match == "prefix":
+            mask |= FILTER_NAME_PREFIX
+            params["name_prefix"] = escape_like(name.lower()) + "%"
+        elif len(name) >= MIN_TRIGRAM_QUERY_LENGTH and db.get_bind().dialect.name == "sqlite":
+            # Quote as an FTS5 phrase so the name is matched as a literal substring
+            mask |= FILTER_NAME_FTS
+            params["name_query"] = '"' + name.lower().replace('"', '""') + '"'
+        else:
+            # PostgreSQL serves LIKE '%name%' from the pg_trgm GIN index
+            mask |= FILTER_NAME
+            params["name_pattern"] = f"%{escape_like(name.lower())}%"
+
+    # An exact-match value that no employee has cannot match; skip the query
+    if not filter_vocabulary.matches(department=department or None,
+                                     position=position or None, location=location or None):
+        return Response(content=b"[]", media_type="application/json")
+
+    if after_id is not None:
+        mask |= FILTER_AFTER_ID
+        params["after_id"] = after_id
 
     # Filter by other exact match fields
     if department:
-        query = query.filter(Employee.department == department)
+        mask |= FILTER_DEPARTMENT
+        params["department"] = department
 
     if position:
-        query = query.filter(Employee.position == position)
+        mask |= FILTER_POSITION
+        params["position"] = position
 
     if location:
-        query = query.filter(Employee.location == location)
+        mask |= FILTER_LOCATION
+        params["location"] = location
 
-    # Apply pagination
-    query = query.offset(offset).limit(limit)
-    
-    employees = query.all()
-    logger.info(f"Search returned {len(employees)} employees")
-    return employees
+    if limit >= STREAM_MIN_LIMIT:
+        # Large pages are not cached; buffering them is what streaming avoids
+        return StreamingResponse(
+            stream_employees(db, SEARCH_STATEMENTS[mask], params),
+            media_type="application/json",
+        )
+
+    # params holds every normalized filter value, in an order fixed by mask
+    cache_key = (mask, *params.values())
+    body = search_cache.get(cache_key)
+    if body is None:
+        employees = db.execute(SEARCH_STATEMENTS[mask], params).mappings().all()
+        logger.info(f"Search returned {len(employees)} employees")
+        # Serialize directly, skipping FastAPI's jsonable_encoder pass;
+        # rows only hold str/int values, which orjson handles natively
+        body = orjson.dumps([dict(employee) for employee in employees])
+        search_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+# Largest accepted bulk request, and the size above which PostgreSQL uses COPY
+MAX_BULK_EMPLOYEES = 10_000
+COPY_THRESHOLD = 1000
+
+# Columns written by bulk inserts, in COPY order
+BULK_COLUMNS = ("first_name", "last_name", "contact_info", "department", "position", "location", "status")
+
+
+def copy_employees(db: Session, rows: List[dict]):
+    """Stream rows into PostgreSQL with COPY inside the session's transaction."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(tuple(row[column] for column in BULK_COLUMNS) for row in rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY employees ({', '.join(BULK_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+@app.post("/employees/bulk", response_model=BulkInsertResponse, status_code=201, tags=["Employees"])
+def create_employees_bulk(
+    employees: List[EmployeeCreate],
+    db: Session = Depends(get_db),
+):
+    """
+    Insert many employees in one request.
+
+    Rows are sent as a single executemany INSERT; on PostgreSQL, batches larger
+    than 1000 rows are streamed with COPY instead.
+    """
+    if len(employees) > MAX_BULK_EMPLOYEES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many employees in one request. Maximum {MAX_BULK_EMPLOYEES} allowed.",
+        )
+
+    rows = [employee.model_dump() for employee in employees]
+    if len(rows) > COPY_THRESHOLD and db.get_bind().dialect.name == "postgresql":
+        copy_employees(db, rows)
+    elif rows:
+        db.execute(insert(Employee), rows)
+    db.commit()
+    search_cache.clear()
+    filter_vocabulary.add(rows)
+
+    logger.info(f"Bulk inserted {len(rows)} employees")
+    return {"inserted": len(rows)}
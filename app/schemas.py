@@ -5,7 +5,8 @@ from typing import Optional
 class EmployeeBase(BaseModel):
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
-    contact_info: str = Field(..., min_length=1)  # JSON string: {"phone": "...", "email": "..."}
+    # JSON string: {"phone": "...", "email": "..."}; capped so rows fit in idx_search_cover
+    contact_info: str = Field(..., min_length=1, max_length=500)
     department: str = Field(..., min_length=1, max_length=100)
     position: str = Field(..., min_length=1, max_length=100)
     location: str = Field(..., min_length=1, max_length=100)
@@ -19,7 +20,7 @@ class EmployeeCreate(EmployeeBase):
 class EmployeeUpdate(BaseModel):
     first_name: Optional[str] = Field(None, min_length=1, max_length=100)
     last_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    contact_info: Optional[str] = Field(None, min_length=1)
+    contact_info: Optional[str] = Field(None, min_length=1, max_length=500)
     department: Optional[str] = Field(None, min_length=1, max_length=100)
     position: Optional[str] = Field(None, min_length=1, max_length=100)
     location: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -30,3 +31,7 @@ class EmployeeResponse(EmployeeBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BulkInsertResponse(BaseModel):
+    inserted: int
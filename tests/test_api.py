@@ -1,15 +1,22 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete
 from sqlalchemy.orm import sessionmaker
-from app.main import app, rate_limiter
-from app.database import Base, get_db
+from sqlalchemy.pool import StaticPool
+from app.main import app, rate_limiter, search_cache, filter_vocabulary
+from app.database import Base, get_db, Employee
 import json
 
-# Create test database
-TEST_DATABASE_URL = "sqlite:///./test_employees.db"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+# Create test database: one in-memory SQLite connection shared by every
+# session (StaticPool), so the schema is built once for the whole module
+TEST_DATABASE_URL = "sqlite://"
+engine = create_engine(
+    TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine)
 
 
 def override_get_db():
@@ -21,8 +28,6 @@ def override_get_db():
         db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
-
 # Store original max_requests value
 original_max_requests = rate_limiter.max_requests
 
@@ -31,23 +36,29 @@ original_max_requests = rate_limiter.max_requests
 def disable_rate_limit():
     """Disable rate limiting for tests by setting a very high limit."""
     rate_limiter.max_requests = 999999
-    rate_limiter.requests.clear()
+    rate_limiter.reset()
+    search_cache.clear()
+    filter_vocabulary.reset()
     yield
     rate_limiter.max_requests = original_max_requests
-    rate_limiter.requests.clear()
+    rate_limiter.reset()
+    search_cache.clear()
+    filter_vocabulary.reset()
 
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
+@pytest.fixture(autouse=True)
+def test_db(monkeypatch):
+    """Point the app at the test database and empty it after each test."""
+    # Set per test so other test modules' overrides don't take over
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
     yield
-    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(delete(Employee))
 
 
-@pytest.fixture(scope="function")
-def client(test_db):
-    """Create a test client."""
+@pytest.fixture(scope="module")
+def client():
+    """Create one test client for the module; test_db isolates each test."""
     return TestClient(app)
 
 
@@ -339,10 +350,10 @@ class TestRateLimiting:
     def enable_rate_limit(self):
         """Enable rate limiting for specific tests."""
         rate_limiter.max_requests = 30
-        rate_limiter.requests.clear()
+        rate_limiter.reset()
         yield
         rate_limiter.max_requests = 999999
-        rate_limiter.requests.clear()
+        rate_limiter.reset()
 
     def test_rate_limit_enforcement(self, client, sample_employee, enable_rate_limit):
         """Test that rate limiting is enforced."""